@@ -1,27 +1,49 @@
 import json
+import os
 from typing import Dict, Any
 
+try:
+    import orjson # Optional, faster drop-in for json
+except ImportError:
+    orjson = None
+
 CONFIG_FILE = "config.json"
 DEFAULT_CONFIG = {
     "max_retries": 3,
     "backoff_base": 2,
-    "storage_file": "queue.json",
-    "lock_file": "queue.lock",
+    "storage_file": "queue.db",
+    "heartbeat_dir": "workers",
     "worker_heartbeat_seconds": 10,
     "worker_timeout_seconds": 30
 }
 
+# Parsed config, reused until config.json's mtime changes
+_CACHE = {"mtime": 0, "cfg": None}
+
 def get_config() -> Dict[str, Any]:
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-            for key, value in DEFAULT_CONFIG.items():
-                config.setdefault(key, value)
-            return config
+        mtime = os.stat(CONFIG_FILE).st_mtime_ns
+        if mtime == _CACHE["mtime"] and _CACHE["cfg"] is not None:
+            return _CACHE["cfg"]
+
+        with open(CONFIG_FILE, 'rb') as f:
+            raw = f.read()
+        config = orjson.loads(raw) if orjson else json.loads(raw)
+        for key, value in DEFAULT_CONFIG.items():
+            config.setdefault(key, value)
+
+        _CACHE["mtime"] = mtime
+        _CACHE["cfg"] = config
+        return config
     except FileNotFoundError:
         save_config(DEFAULT_CONFIG)
         return DEFAULT_CONFIG
 
 def save_config(config: Dict[str, Any]):
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
\ No newline at end of file
+    if orjson:
+        with open(CONFIG_FILE, 'wb') as f:
+            f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+    else:
+        with open(CONFIG_FILE, 'w') as f:
+            json.dump(config, f, indent=2)
+    _CACHE["mtime"] = 0
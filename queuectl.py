@@ -10,10 +10,19 @@ from rich.table import Table
 import multiprocessing
 import time
 import os
+from datetime import datetime
 
 app = typer.Typer(help="queuectl: A CLI-based background job queue system.")
 console = Console()
 
+VALID_STATES = ('pending', 'processing', 'completed', 'dead')
+# Expected type of each config value, used to coerce `config set` input
+_TYPE_MAP = {key: type(value) for key, value in cfg.DEFAULT_CONFIG.items()}
+
+def _format_ts(ts: float) -> str:
+    # Timestamps are stored as epoch seconds; show them in local time
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
 @app.command()
 def enqueue(
     command: str = typer.Argument(..., help="The shell command to execute."),
@@ -51,9 +60,8 @@ def status():
 def list_jobs(
     state: str = typer.Option("pending", "--state", help="Filter jobs by state (pending, processing, completed, dead).")
 ):
-    valid_states = ['pending', 'processing', 'completed', 'dead']
-    if state not in valid_states:
-        console.print(f"Invalid state. Must be one of: {', '.join(valid_states)}", style="red")
+    if state not in VALID_STATES:
+        console.print(f"Invalid state. Must be one of: {', '.join(VALID_STATES)}", style="red")
         raise typer.Exit(code=1)
 
     jobs = storage.list_jobs(state)
@@ -74,16 +82,16 @@ def list_jobs(
     for job in jobs:
         if state == 'dead':
             table.add_row(
-                job['id'],
-                job['command'],
-                job['updated_at']
+                job.id,
+                job.command,
+                _format_ts(job.updated_at)
             )
         else:
             table.add_row(
-                job['id'],
-                job['command'],
-                job['updated_at'],
-                str(job.get('attempts', 'N/A'))
+                job.id,
+                job.command,
+                _format_ts(job.updated_at),
+                str(job.attempts)
             )
     
     console.print(table)
@@ -100,10 +108,11 @@ def start(
     console.print(f"Starting {count} worker(s)... Press CTRL+C to stop.")
     
     stop_event = multiprocessing.Event()
+    job_available = multiprocessing.Event()
     processes: List[multiprocessing.Process] = []
     
     for _ in range(count):
-        proc = multiprocessing.Process(target=start_worker_loop, args=(stop_event,))
+        proc = multiprocessing.Process(target=start_worker_loop, args=(stop_event, job_available))
         proc.start()
         processes.append(proc)
         
@@ -113,6 +122,7 @@ def start(
     except KeyboardInterrupt:
         console.print("\nGraceful shutdown initiated... (telling workers to stop)")
         stop_event.set()
+        job_available.set() # Wake idle workers so they see the stop
         
         for proc in processes:
             proc.join(timeout=5)
@@ -131,20 +141,21 @@ def set(
     key: str = typer.Argument(..., help="e.g., max_retries or backoff_base"),
     value: str = typer.Argument(..., help="The new value to set.")
 ):
-    config = cfg.get_config()
-    
-    if key not in config:
+    if key not in _TYPE_MAP:
         console.print(f"Unknown config key: [bold]{key}[/bold]", style="red")
-        console.print(f"Available keys: {', '.join(config.keys())}")
+        console.print(f"Available keys: {', '.join(_TYPE_MAP)}")
         raise typer.Exit(code=1)
         
+    original_type = _TYPE_MAP[key]
     try:
-        original_type = type(config[key])
-        config[key] = original_type(value)
+        new_value = original_type(value)
     except ValueError:
         console.print(f"Invalid value type for {key}. Expected {original_type.__name__}.", style="red")
         raise typer.Exit(code=1)
         
+    # Only read the current config once the input is known to be valid
+    config = dict(cfg.get_config())
+    config[key] = new_value
     cfg.save_config(config)
     console.print(f"Config updated: [bold]{key}[/bold] = {config[key]}")
 
@@ -1,240 +1,483 @@
+import itertools
 import json
-import uuid
 import os
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
-from filelock import FileLock
-from config import get_config
+import sqlite3
+import time
+from contextlib import contextmanager, closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Iterator, Tuple, Any
+from config import get_config, save_config
 
-CONFIG = get_config()
+try:
+    import fcntl
+except ImportError: # Windows: rely on SQLite's own busy handler
+    fcntl = None
+
+def _upgrade_legacy_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    # A config.json from the JSON-file store names queue.json as storage_file
+    # and still carries lock_file. Point it at a database next to the old
+    # file (init_storage() imports the jobs) and drop the unused key.
+    storage_file = config['storage_file']
+    if not storage_file.endswith(".json") and "lock_file" not in config:
+        return config
+
+    config = dict(config)
+    config.pop("lock_file", None)
+    if storage_file.endswith(".json"):
+        config['storage_file'] = os.path.splitext(storage_file)[0] + ".db"
+        print(f"Upgrading config: storage_file {storage_file} -> {config['storage_file']}")
+    save_config(config)
+    return config
+
+CONFIG = _upgrade_legacy_config(get_config())
 STORAGE_FILE = CONFIG['storage_file']
-LOCK_FILE = CONFIG['lock_file']
+# The JSON store this database replaced; imported once, then renamed
+LEGACY_JSON_FILE = os.path.splitext(STORAGE_FILE)[0] + ".json"
+# One empty file per worker; its mtime is the worker's last heartbeat.
+# A heartbeat is a single utime() call and never touches the database.
+HEARTBEAT_DIR = CONFIG['heartbeat_dir']
+
+# Settings read on hot paths, copied out of the config dict so those paths
+# don't look them up (or stat config.json) on every call. Long-running
+# processes pick up edits by calling reload_config().
+_MAX_RETRIES = CONFIG['max_retries']
+_BACKOFF_BASE = CONFIG['backoff_base']
+_WORKER_TIMEOUT = CONFIG['worker_timeout_seconds']
+
+# Earliest time a known worker's heartbeat can go stale (see
+# _get_active_worker_count). Only pays off in a process that calls
+# get_status() repeatedly; today's sole caller, the one-shot
+# `queuectl status`, always takes the full pass.
+_NEXT_PRUNE_AT = 0.0
+
+# Completions/failures are buffered per process and written together with
+# the next dequeue (or once this many pile up, or on flush_pending()).
+FLUSH_THRESHOLD = 16
+_pending_updates: List[Tuple[str, str, float]] = []
+
+# In WAL mode every commit is an append to <db>-wal; checkpoints fold it
+# back into the main file. Cap what an idle -wal file may keep on disk.
+WAL_SIZE_LIMIT = 4 * 1024 * 1024
+
+# Job ids: a counter seeded with the start time in microseconds, suffixed
+# with the full pid so two processes seeded in the same microsecond differ.
+# Much cheaper than uuid4() (no urandom read) and shorter to type.
+_ID_COUNTER = itertools.count(time.time_ns() // 1000)
+
+_CONN: Optional[sqlite3.Connection] = None
+_CONN_PID: Optional[int] = None
+
+# How long a writer waits for the database before giving up, both for
+# SQLite's busy handler and for the flock() below
+BUSY_TIMEOUT_SECONDS = 10
+
+# Writers queue on flock() here before BEGIN IMMEDIATE, polling far more
+# often than SQLite's busy handler, which backs off to 100ms sleeps.
+LOCK_FILE = STORAGE_FILE + ".lock"
+_LOCK_POLL_SECONDS = 0.001
+_LOCK_FD: Optional[int] = None
+_LOCK_PID: Optional[int] = None
+
+@dataclass(slots=True)
+class Job:
+    # Field order matches the jobs/dlq column order (JOB_COLUMNS)
+    id: str
+    command: str
+    state: str
+    attempts: int
+    max_retries: int
+    run_at: float
+    created_at: float
+    updated_at: float
+
+JOB_COLUMNS = ("id", "command", "state", "attempts", "max_retries", "run_at", "created_at", "updated_at")
+
+# Write statements are built once here rather than formatted on every call;
+# the identical strings also keep hitting sqlite3's prepared-statement cache.
+_COLUMN_LIST = ", ".join(JOB_COLUMNS)
+INSERT_JOB_SQL = f"INSERT INTO jobs ({_COLUMN_LIST}) VALUES ({', '.join('?' for _ in JOB_COLUMNS)})"
+MOVE_TO_DLQ_SQL = (
+    f"INSERT OR REPLACE INTO dlq ({_COLUMN_LIST}) "
+    "SELECT id, command, 'dead', ?, max_retries, run_at, created_at, ? "
+    "FROM jobs WHERE id = ?"
+)
+# Oldest runnable job first
+NEXT_JOB_SQL = (
+    f"SELECT {_COLUMN_LIST} FROM jobs WHERE state = 'pending' AND run_at <= ? "
+    "ORDER BY created_at LIMIT 1"
+)
+STATUS_SQL = (
+    "SELECT state, COUNT(*) FROM jobs GROUP BY state "
+    "UNION ALL SELECT 'dead', COUNT(*) FROM dlq"
+)
+LIST_JOBS_SQL = f"SELECT {_COLUMN_LIST} FROM jobs WHERE state = ? ORDER BY created_at"
+LIST_DLQ_SQL = f"SELECT {_COLUMN_LIST} FROM dlq ORDER BY created_at"
+RETRY_FROM_DLQ_SQL = (
+    f"INSERT INTO jobs ({_COLUMN_LIST}) "
+    "SELECT id, command, 'pending', 0, max_retries, ?, created_at, ? "
+    "FROM dlq WHERE id = ?"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    command TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_retries INTEGER NOT NULL,
+    run_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+-- Walks pending jobs in created_at order, so dequeue stops at the first
+-- runnable row instead of sorting every ready job. Also serves list/status.
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, created_at, run_at);
+
+CREATE TABLE IF NOT EXISTS dlq (
+    id TEXT PRIMARY KEY,
+    command TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_retries INTEGER NOT NULL,
+    run_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+def _connect() -> sqlite3.Connection:
+    # isolation_level=None: we issue BEGIN/COMMIT ourselves
+    conn = sqlite3.connect(STORAGE_FILE, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA journal_size_limit={WAL_SIZE_LIMIT}")
+    return conn
+
+def _get_conn() -> sqlite3.Connection:
+    # One long-lived connection per process instead of open/close per call.
+    # A connection must never be used across fork(), so a child process
+    # that inherited one opens its own.
+    global _CONN, _CONN_PID
+    pid = os.getpid()
+    if _CONN is None or _CONN_PID != pid:
+        _CONN = _connect()
+        _CONN_PID = pid
+    return _CONN
 
-def _get_lock():
-    return FileLock(LOCK_FILE, timeout=10)
+@contextmanager
+def _writer_lock() -> Iterator[None]:
+    global _LOCK_FD, _LOCK_PID
+    if fcntl is None:
+        yield
+        return
 
-def _read_data() -> Dict[str, List[Dict[str, Any]]]:
+    # flock() locks belong to the open file, which a forked child shares
+    # with its parent, so each process opens its own descriptor.
+    pid = os.getpid()
+    if _LOCK_FD is None or _LOCK_PID != pid:
+        _LOCK_FD = os.open(LOCK_FILE, os.O_CREAT | os.O_RDWR)
+        _LOCK_PID = pid
+
+    deadline = time.monotonic() + BUSY_TIMEOUT_SECONDS
+    while True:
+        try:
+            fcntl.flock(_LOCK_FD, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            break
+        except BlockingIOError:
+            # Fail like SQLite would rather than hang behind a stuck writer
+            if time.monotonic() >= deadline:
+                raise sqlite3.OperationalError("database is locked")
+            time.sleep(_LOCK_POLL_SECONDS)
     try:
-        with open(STORAGE_FILE, 'r') as f:
-            data = json.load(f)
-            if "active_workers" not in data:
-                data["active_workers"] = []
-            return data
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {"jobs": [], "dlq": [], "active_workers": []}
-
-def _write_data(data: Dict[str, List[Dict[str, Any]]]):
-    with open(STORAGE_FILE, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+        yield
+    finally:
+        fcntl.flock(_LOCK_FD, fcntl.LOCK_UN)
 
-def init_storage():
-    with _get_lock():
+@contextmanager
+def _transaction() -> Iterator[sqlite3.Connection]:
+    # BEGIN IMMEDIATE takes the write lock up front, so a read followed by
+    # an update can't race with another worker doing the same.
+    conn = _get_conn()
+    with _writer_lock():
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+def reload_config():
+    global _MAX_RETRIES, _BACKOFF_BASE, _WORKER_TIMEOUT, _NEXT_PRUNE_AT
+    cfg = get_config()
+    _MAX_RETRIES = cfg['max_retries']
+    _BACKOFF_BASE = cfg['backoff_base']
+    _WORKER_TIMEOUT = cfg['worker_timeout_seconds']
+    _NEXT_PRUNE_AT = 0.0 # The timeout may have changed
+
+def _legacy_timestamp(value: str) -> float:
+    # The JSON store kept naive UTC datetimes as strings
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+
+def _legacy_row(job: Dict[str, Any]) -> tuple:
+    state = job["state"]
+    if state == "processing":
+        state = "pending" # Its worker is gone; run it again
+    return (
+        job["id"], job["command"], state, job["attempts"], job["max_retries"],
+        _legacy_timestamp(job["run_at"]),
+        _legacy_timestamp(job["created_at"]),
+        _legacy_timestamp(job["updated_at"]),
+    )
+
+def _import_legacy_json():
+    with _transaction() as conn:
+        # Checked under the writer lock: another process may have just
+        # imported (and renamed) the file
         try:
-            with open(STORAGE_FILE, 'r') as f:
+            with open(LEGACY_JSON_FILE, 'r') as f:
                 data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            with open(STORAGE_FILE, 'w') as f:
-                json.dump({"jobs": [], "dlq": [], "active_workers": []}, f)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError:
+            data = {} # The JSON store treated an unreadable file as empty
+
+        placeholders = ", ".join('?' for _ in JOB_COLUMNS)
+        jobs = [_legacy_row(job) for job in data.get("jobs", [])]
+        dead = [_legacy_row(job) for job in data.get("dlq", [])]
+        conn.executemany(f"INSERT OR IGNORE INTO jobs ({_COLUMN_LIST}) VALUES ({placeholders})", jobs)
+        conn.executemany(f"INSERT OR IGNORE INTO dlq ({_COLUMN_LIST}) VALUES ({placeholders})", dead)
+        os.replace(LEGACY_JSON_FILE, LEGACY_JSON_FILE + ".migrated")
+
+    print(f"Imported {len(jobs)} jobs and {len(dead)} dead jobs from {LEGACY_JSON_FILE} into {STORAGE_FILE}.")
+
+def init_storage():
+    with closing(_connect()) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+    if os.path.exists(LEGACY_JSON_FILE):
+        _import_legacy_json()
+    os.makedirs(HEARTBEAT_DIR, exist_ok=True)
+
+def checkpoint():
+    """Fold the write-ahead log into the database file and truncate it."""
+    _get_conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+def _new_job_id() -> str:
+    # pid is read per call so forked children, which inherit the counter,
+    # still produce distinct ids
+    return f"{next(_ID_COUNTER):x}-{os.getpid():x}"
 
 def enqueue_job(command: str, max_retries: Optional[int] = None) -> str:
-    cfg = get_config()
-    job_id = str(uuid.uuid4())
-    now = datetime.utcnow()
-    
-    job = {
-        "id": job_id,
-        "command": command,
-        "state": "pending",
-        "attempts": 0,
-        "max_retries": max_retries if max_retries is not None else cfg['max_retries'],
-        "run_at": now,
-        "created_at": now,
-        "updated_at": now,
-    }
-    
-    with _get_lock():
-        data = _read_data()
-        data["jobs"].append(job)
-        _write_data(data)
-        
+    job_id = _new_job_id()
+    now = time.time()
+
+    if max_retries is None:
+        max_retries = _MAX_RETRIES
+
+    # Bind the row straight from locals (same order as JOB_COLUMNS); no
+    # intermediate job dict is built just to be flattened again
+    _get_conn().execute(
+        INSERT_JOB_SQL,
+        (job_id, command, "pending", 0, max_retries, now, now, now)
+    )
+
     return job_id
 
-def get_next_job_for_worker() -> Optional[Dict[str, Any]]:
-    with _get_lock():
-        data = _read_data()
-        now = datetime.utcnow()
-        
-        found_job = None
-        job_index = -1
-
-        # Sort by creation time to process oldest first
-        pending_jobs = []
-        for i, job in enumerate(data["jobs"]):
-            if job["state"] == "pending" and job["run_at"] <= now.isoformat():
-                pending_jobs.append((i, job))
-        
-        # Sort by created_at
-        pending_jobs.sort(key=lambda x: x[1]["created_at"])
-
-        if pending_jobs:
-            job_index, found_job = pending_jobs[0]
-            found_job["state"] = "processing"
-            found_job["updated_at"] = datetime.utcnow()
-            data["jobs"][job_index] = found_job
-            _write_data(data)
-            return found_job
+def _has_runnable_job() -> bool:
+    # Plain read: in WAL mode this neither takes nor waits for the write lock
+    conn = _get_conn()
+    row = conn.execute(
+        "SELECT 1 FROM jobs WHERE state = 'pending' AND run_at <= ? LIMIT 1",
+        (time.time(),)
+    ).fetchone()
+    return row is not None
+
+def get_next_job_for_worker() -> Optional[Job]:
+    found_job = None
+
+    # Idle workers poll constantly; don't make them queue up for the write
+    # lock (and block enqueues) just to find out there's nothing to do.
+    if not _pending_updates and not _has_runnable_job():
+        return None
+
+    with _transaction() as conn:
+        # Results of the previous job(s) go out in the same commit
+        flushed = _apply_pending(conn)
+        now = time.time()
+
+        row = conn.execute(NEXT_JOB_SQL, (now,)).fetchone()
+
+        if row is not None:
+            found_job = Job(*row)
+            found_job.state = "processing"
+            found_job.updated_at = now
+            conn.execute(
+                "UPDATE jobs SET state = 'processing', updated_at = ? WHERE id = ?",
+                (now, found_job.id)
+            )
+
+    del _pending_updates[:flushed]
+    return found_job
+
+def _apply_completed(conn: sqlite3.Connection, job_id: str, at: float):
+    conn.execute(
+        "UPDATE jobs SET state = 'completed', updated_at = ? WHERE id = ?",
+        (at, job_id)
+    )
+
+def _apply_failed(conn: sqlite3.Connection, job_id: str, at: float):
+    row = conn.execute(
+        "SELECT attempts, max_retries FROM jobs WHERE id = ?", (job_id,)
+    ).fetchone()
+    if row is None:
+        return
+
+    attempts = row["attempts"] + 1
+
+    if attempts >= row["max_retries"]:
+        # Move the row by key without round-tripping it through Python
+        conn.execute(MOVE_TO_DLQ_SQL, (attempts, at, job_id))
+        conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+    else:
+        delay_seconds = _BACKOFF_BASE ** attempts
+        conn.execute(
+            "UPDATE jobs SET attempts = ?, run_at = ?, state = 'pending', updated_at = ? WHERE id = ?",
+            (
+                attempts,
+                at + delay_seconds,
+                at,
+                job_id
+            )
+        )
+
+def _apply_pending(conn: sqlite3.Connection) -> int:
+    # Callers drop the applied entries only once the transaction commits
+    for job_id, new_state, at in _pending_updates:
+        if new_state == "completed":
+            _apply_completed(conn, job_id, at)
         else:
-            return None
+            _apply_failed(conn, job_id, at)
+    return len(_pending_updates)
+
+def _queue_update(job_id: str, new_state: str):
+    _pending_updates.append((job_id, new_state, time.time()))
+    if len(_pending_updates) >= FLUSH_THRESHOLD:
+        flush_pending()
+
+def flush_pending():
+    """Write all buffered completions/failures in a single transaction."""
+    if not _pending_updates:
+        return
+    with _transaction() as conn:
+        flushed = _apply_pending(conn)
+    del _pending_updates[:flushed]
 
 def update_job_to_completed(job_id: str):
-    with _get_lock():
-        data = _read_data()
-        job_found = False
-        for job in data["jobs"]:
-            if job["id"] == job_id:
-                job["state"] = "completed"
-                job["updated_at"] = datetime.utcnow()
-                job_found = True
-                break
-        
-        if job_found:
-            _write_data(data)
-
-def handle_failed_job(job: Dict[str, Any]):
-    with _get_lock():
-        data = _read_data()
-        cfg = get_config()
-        
-        job_index = -1
-        for i, j in enumerate(data["jobs"]):
-            if j["id"] == job["id"]:
-                job_index = i
-                break
-        
-        if job_index == -1:
-            return
+    _queue_update(job_id, "completed")
 
-        job_in_db = data["jobs"][job_index]
-        job_in_db["attempts"] += 1
-        
-        if job_in_db["attempts"] >= job_in_db["max_retries"]:
-            failed_job = data["jobs"].pop(job_index)
-            failed_job["state"] = "dead"
-            data["dlq"].append(failed_job)
-        else:
-            delay_seconds = cfg['backoff_base'] ** job_in_db['attempts']
-            job_in_db["run_at"] = datetime.utcnow() + timedelta(seconds=delay_seconds)
-            job_in_db["state"] = "pending"
-            job_in_db["updated_at"] = datetime.utcnow()
-            data["jobs"][job_index] = job_in_db
-        
-        _write_data(data)
-
-def _get_active_worker_count(data: dict) -> int:
-    cfg = get_config()
-    timeout_seconds = cfg['worker_timeout_seconds']
-    now = datetime.utcnow()
-    
-    active_workers = []
-    
-    for worker in data.get("active_workers", []):
+def handle_failed_job(job: Job):
+    _queue_update(job.id, "failed")
+
+def _heartbeat_path(pid: int) -> str:
+    return os.path.join(HEARTBEAT_DIR, str(pid))
+
+def _get_active_worker_count() -> int:
+    global _NEXT_PRUNE_AT
+    now = time.time()
+
+    # Heartbeats only move forward, so until the oldest live heartbeat
+    # expires nobody can have gone stale: every file is a live worker.
+    # Heartbeat files are named by pid; anything else (.DS_Store, editor
+    # backups) is not a worker.
+    if now < _NEXT_PRUNE_AT:
+        return sum(1 for name in os.listdir(HEARTBEAT_DIR) if name.isdigit())
+
+    cutoff = now - _WORKER_TIMEOUT
+    active = 0
+    oldest = now
+    stale = []
+    with os.scandir(HEARTBEAT_DIR) as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+            except FileNotFoundError:
+                continue # Worker unregistered while we were scanning
+            if mtime >= cutoff:
+                active += 1
+                oldest = min(oldest, mtime)
+            else:
+                stale.append(entry.path)
+
+    # Drop workers that stopped sending heartbeats
+    for path in stale:
         try:
-            last_heartbeat = datetime.fromisoformat(worker["last_heartbeat"])
-            if (now - last_heartbeat).total_seconds() < timeout_seconds:
-                active_workers.append(worker)
-        except (ValueError, TypeError):
-            continue # Skip bad entries
-            
-    data["active_workers"] = active_workers
-    return len(active_workers)
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    # Workers that register from now on start with a fresh heartbeat
+    _NEXT_PRUNE_AT = oldest + _WORKER_TIMEOUT
+    return active
 
 def get_status() -> Dict[str, int]:
-    with _get_lock():
-        data = _read_data()
-        active_worker_count = _get_active_worker_count(data)
-        _write_data(data) # Save data to clean up stale workers
-    
+    active_worker_count = _get_active_worker_count()
+
+    # One statement, so both counts come from the same snapshot: a job
+    # moving to the DLQ mid-read is counted exactly once
+    rows = _get_conn().execute(STATUS_SQL).fetchall()
+
     stats = {}
-    for job in data["jobs"]:
-        state = job["state"]
-        stats[state] = stats.get(state, 0) + 1
-        
-    stats["dead"] = len(data["dlq"])
+    for state, count in rows:
+        stats[state] = count
+
     stats["active_workers"] = active_worker_count
     return stats
 
-def list_jobs(state: str) -> List[Dict[str, Any]]:
-    with _get_lock():
-        data = _read_data()
-    
+def list_jobs(state: str) -> List[Job]:
+    conn = _get_conn()
     if state == 'dead':
-        return data["dlq"]
+        rows = conn.execute(LIST_DLQ_SQL).fetchall()
     else:
-        return [job for job in data["jobs"] if job["state"] == state]
+        rows = conn.execute(LIST_JOBS_SQL, (state,)).fetchall()
+
+    return [Job(*row) for row in rows]
 
 def register_worker(pid: int):
-    with _get_lock():
-        data = _read_data()
-        now = datetime.utcnow()
-        
-        # Remove any old entry for this PID just in case
-        data["active_workers"] = [w for w in data["active_workers"] if w["pid"] != pid]
-        
-        data["active_workers"].append({
-            "pid": pid,
-            "last_heartbeat": now
-        })
-        _write_data(data)
+    # Truncates any old entry for this PID just in case
+    with open(_heartbeat_path(pid), 'w'):
+        pass
     print(f"Worker {pid} registered.")
 
 def unregister_worker(pid: int):
-    with _get_lock():
-        data = _read_data()
-        data["active_workers"] = [w for w in data["active_workers"] if w["pid"] != pid]
-        _write_data(data)
+    try:
+        os.remove(_heartbeat_path(pid))
+    except FileNotFoundError:
+        pass
     print(f"Worker {pid} unregistered.")
 
 def worker_heartbeat(pid: int):
-    with _get_lock():
-        data = _read_data()
-        worker_found = False
-        for worker in data["active_workers"]:
-            if worker["pid"] == pid:
-                worker["last_heartbeat"] = datetime.utcnow()
-                worker_found = True
-                break
-        
-        if worker_found:
-            _write_data(data)
-        else:
-            # Worker wasn't in list, maybe from a stale file. Register it.
-            _write_data(data)
-            register_worker(pid) # This will re-call and get the lock
+    try:
+        os.utime(_heartbeat_path(pid))
+    except FileNotFoundError:
+        # Worker was pruned as stale (or never registered). Register it.
+        register_worker(pid)
 
 
 def retry_dlq_job(job_id: str) -> bool:
-    with _get_lock():
-        data = _read_data()
-        
-        job_index = -1
-        for i, job in enumerate(data["dlq"]):
-            if job["id"] == job_id:
-                job_index = i
-                break
-        
-        if job_index == -1:
+    with _transaction() as conn:
+        now = time.time()
+
+        # Reset and add back to main jobs table
+        cursor = conn.execute(RETRY_FROM_DLQ_SQL, (now, now, job_id))
+
+        if cursor.rowcount == 0:
             return False # Job not found in DLQ
-            
-        # Remove from DLQ and reset for queue
-        job = data["dlq"].pop(job_index)
-        job["state"] = "pending"
-        job["attempts"] = 0
-        job["run_at"] = datetime.utcnow()
-        job["updated_at"] = datetime.utcnow()
-        
-        # Add back to main jobs list
-        data["jobs"].append(job)
-        _write_data(data)
+
+        conn.execute("DELETE FROM dlq WHERE id = ?", (job_id,))
         return True
 
-init_storage()
\ No newline at end of file
+init_storage()
@@ -2,7 +2,7 @@
 echo "--- QueueCTL Validation Script ---"
 
 echo "Clearing storage and config..."
-rm -f queue.json queue.lock config.json
+rm -rf queue.db queue.db-wal queue.db-shm queue.db.lock workers config.json
 
 py queuectl.py config set max_retries 2
 py queuectl.py config set backoff_base 1
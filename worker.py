@@ -3,40 +3,96 @@ import subprocess
 import shlex
 import storage
 import os
+import signal
+import threading
+from typing import Tuple
 from config import get_config
 
-def run_job(job: dict):
-    print(f"Worker: Starting job {job['id']}: {job['command']}")
+JOB_TIMEOUT_SECONDS = 60
+# Only this much of a failing job's stderr is kept for the log
+STDERR_TAIL_BYTES = 8 * 1024
+_READ_CHUNK = 4096
+
+def _drain_stderr(stream, tail: bytearray):
+    # Read fixed-size chunks rather than lines, so output without newlines
+    # is bounded too, and keep reading to EOF so the child never blocks on
+    # a full pipe. Raw bytes: nothing here can fail on bad encoding.
+    # The pipe is closed here, at EOF, rather than by the caller, which may
+    # return while a grandchild still holds the other end.
+    with stream:
+        try:
+            for chunk in iter(lambda: stream.read(_READ_CHUNK), b""):
+                tail += chunk
+                del tail[:-STDERR_TAIL_BYTES]
+        except OSError:
+            pass # Pipe broke under us; nothing left to drain
+
+def _kill_job(proc: subprocess.Popen):
+    # Kill the whole group, not just the shell: a surviving grandchild would
+    # keep the stderr pipe open and the reader thread waiting for EOF.
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass # Already gone
+    else:
+        proc.kill()
+
+def _run_command(command: str) -> Tuple[int, str]:
+    # Stream stderr through a bounded buffer instead of capture_output, so a
+    # chatty job can't grow the worker's memory without limit.
+    # Use shell=True to allow Windows to find built-in commands like 'echo'.
+    # Its own session puts the shell and everything it starts in one process
+    # group, so a kill reaches them all (start_new_session is POSIX only).
+    proc = subprocess.Popen(
+        command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        shell=True,
+        start_new_session=True
+    )
+    tail = bytearray()
+    reader = threading.Thread(target=_drain_stderr, args=(proc.stderr, tail), daemon=True)
+    reader.start()
+
+    try:
+        returncode = proc.wait(timeout=JOB_TIMEOUT_SECONDS)
+    except BaseException:
+        # Timed out, or CTRL+C, which no longer reaches the job's own session
+        _kill_job(proc)
+        proc.wait()
+        raise
+    finally:
+        # A grandchild of the shell may still hold stderr open; don't hang on it
+        reader.join(timeout=1)
+
+    return returncode, bytes(tail).decode(errors="replace")
+
+def run_job(job: storage.Job):
+    print(f"Worker: Starting job {job.id}: {job.command}")
     try:
-        # Use shell=True to allow Windows to find built-in commands like 'echo'
-        result = subprocess.run(
-            job['command'], 
-            capture_output=True, 
-            text=True, 
-            timeout=60, 
-            shell=True
-        )
+        returncode, stderr_tail = _run_command(job.command)
         
-        if result.returncode == 0:
-            print(f"Worker: Job {job['id']} completed successfully.")
-            storage.update_job_to_completed(job['id'])
+        if returncode == 0:
+            print(f"Worker: Job {job.id} completed successfully.")
+            storage.update_job_to_completed(job.id)
         else:
-            print(f"Worker: Job {job['id']} failed with code {result.returncode}.")
-            print(f"Worker: Stderr: {result.stderr}")
+            print(f"Worker: Job {job.id} failed with code {returncode}.")
+            print(f"Worker: Stderr: {stderr_tail}")
             storage.handle_failed_job(job)
             
     except FileNotFoundError:
-        print(f"Worker: Job {job['id']} failed. Command not found: {job['command']}")
+        print(f"Worker: Job {job.id} failed. Command not found: {job.command}")
         storage.handle_failed_job(job)
     except subprocess.TimeoutExpired:
-        print(f"Worker: Job {job['id']} timed out.")
+        print(f"Worker: Job {job.id} timed out.")
         storage.handle_failed_job(job)
     except Exception as e:
-        print(f"Worker: Job {job['id']} failed with unexpected error: {e}")
+        print(f"Worker: Job {job.id} failed with unexpected error: {e}")
         storage.handle_failed_job(job)
 
 
-def start_worker_loop(stop_event):
+def start_worker_loop(stop_event, job_available):
     pid = os.getpid()
     cfg = get_config()
     heartbeat_interval = cfg['worker_heartbeat_seconds']
@@ -50,20 +106,33 @@ def start_worker_loop(stop_event):
             now = time.time()
             if (now - last_heartbeat) > heartbeat_interval:
                 storage.worker_heartbeat(pid)
+                # Pick up `config set` changes made since the last beat
+                storage.reload_config()
                 last_heartbeat = now
             
             job = storage.get_next_job_for_worker()
             
             if job:
+                # More jobs may be queued behind this one; wake idle siblings
+                # so they check now instead of at their next poll.
+                job_available.set()
                 run_job(job)
             else:
                 try:
-                    # Sleep, but check for stop_event frequently
-                    stop_event.wait(timeout=1.0)
+                    # Sleep until a sibling finds work (or stop is requested),
+                    # but still poll for jobs enqueued from other processes
+                    job_available.wait(timeout=1.0)
+                    job_available.clear()
                 except KeyboardInterrupt:
                     break # Exit loop on interrupt
     
     finally:
         # This will run on graceful shutdown (CTRL+C)
+        try:
+            storage.flush_pending()
+        except Exception as e:
+            # Don't mask whatever ended the loop, and still clean up below
+            print(f"Worker {pid}: could not flush pending job updates: {e}")
         storage.unregister_worker(pid)
+        storage.checkpoint()
         print(f"Worker process {pid} shutting down...")
\ No newline at end of file